@@ -0,0 +1,96 @@
+"""
+chart_utils.py - Chart drawing and output helpers shared by main and graph_generator
+"""
+import io
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+# Bars whose low and high pay are equal are drawn this fraction of the y-axis
+# range tall, with a heavier outline, so they stay visible
+ZERO_BAR_THICKNESS_RATIO = 0.02
+ZERO_BAR_LINEWIDTH = 3
+BAR_LINEWIDTH = 1
+
+# zlib level for rendered PNGs.  Level 1 encodes several times faster than
+# the default 6 for slightly larger files; the pixels are identical.
+PNG_COMPRESS_LEVEL = 1
+
+# Write buffer for HTML reports (1 MiB) so fragments stream out in large chunks
+HTML_WRITE_BUFFER = 1 << 20
+
+# Raster formats Pillow can encode from an already-rendered PNG, mapped to
+# their Pillow format names
+PIL_FORMATS = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'webp': 'WEBP'}
+
+
+def bar_geometry(lows: np.ndarray, highs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute heights and outline widths for floating low-to-high bars.
+
+    Args:
+        lows: Bottom of each bar
+        highs: Top of each bar
+
+    Returns:
+        Tuple of (heights, linewidths), with zero-height bars widened to a
+        visible sliver and given a thicker outline
+    """
+    heights = highs - lows
+    y_range = max(lows.max(), highs.max()) - min(lows.min(), highs.min())
+    zero_bar_height = y_range * ZERO_BAR_THICKNESS_RATIO if y_range > 0 else 1.0
+    is_zero = heights == 0
+    return (
+        np.where(is_zero, zero_bar_height, heights),
+        np.where(is_zero, ZERO_BAR_LINEWIDTH, BAR_LINEWIDTH),
+    )
+
+
+def tight_bbox(fig):
+    """
+    Return the padded tight bounding box of *fig*, in inches.
+
+    Equivalent to what ``savefig(bbox_inches='tight')`` computes; working it
+    out once lets every format of the same chart reuse it instead of walking
+    all artists again on each save.
+    """
+    renderer = fig.canvas.get_renderer()
+    return fig.get_tightbbox(renderer).padded(plt.rcParams['savefig.pad_inches'])
+
+
+def write_raster(
+    png_bytes: bytes,
+    file_path: Union[str, Path],
+    fmt: str,
+    scale: float = 1.0,
+    dpi: Optional[float] = None,
+) -> None:
+    """
+    Write a rendered PNG to *file_path*, re-encoding it for JPEG/WebP.
+
+    Args:
+        png_bytes: Chart already rendered as PNG
+        file_path: Destination file
+        fmt: Output format extension (``'png'`` or a key of ``PIL_FORMATS``)
+        scale: Resize factor applied before re-encoding
+        dpi: Resolution recorded in the re-encoded file's metadata
+    """
+    if fmt == 'png':
+        with open(file_path, 'wb') as f:
+            f.write(png_bytes)
+        return
+
+    with Image.open(io.BytesIO(png_bytes)) as png:
+        image = png.convert('RGB')
+    if scale != 1.0:
+        image = image.resize(
+            (round(image.width * scale), round(image.height * scale)),
+            Image.Resampling.LANCZOS,
+        )
+    save_kwargs: Dict[str, Any] = {'quality': 85, 'optimize': True}
+    if dpi is not None:
+        save_kwargs['dpi'] = (dpi, dpi)
+    image.save(file_path, PIL_FORMATS[fmt], **save_kwargs)
@@ -16,6 +16,10 @@ import yaml
 # Version info
 __version__ = "1.0.0"
 
+# Input file extensions accepted by -i.  Keep this in sync with
+# SUPPORTED_EXTENSIONS in main.py (not imported here to keep --help fast).
+SUPPORTED_EXTENSIONS = frozenset({'.csv', '.xls', '.xlsx', '.ods'})
+
 
 def setup_logging(verbose: bool = False, quiet: bool = False, log_file: Optional[str] = None) -> logging.Logger:
     """
@@ -264,7 +268,7 @@ def validate_args(args: argparse.Namespace) -> None:
     
     # Check file extension is supported
     ext = Path(args.i).suffix.lower()
-    if ext not in ['.csv', '.xls', '.xlsx', '.ods']:
+    if ext not in SUPPORTED_EXTENSIONS:
         raise ValueError(f"Unsupported file format: {ext}")
     
     # Check for conflicting options
@@ -19,7 +19,7 @@ class CompensationDataParser:
     
     SUPPORTED_FORMATS = {'.csv', '.xls', '.xlsx', '.ods'}
     # Columns that are report summaries, not employer data.
-    # Keep this in sync with remove_summary_columns() in main.py.
+    # Keep this in sync with SUMMARY_COLUMNS in main.py.
     BAD_COLUMNS = [
         'Comp Data Points',
         'Comp Average',
@@ -67,7 +67,7 @@ class CompensationDataParser:
         try:
             suffix = self.filepath.suffix.lower()
             if suffix == '.csv':
-                df = pd.read_csv(self.filepath)
+                df = pd.read_csv(self.filepath, memory_map=True)
             elif suffix in {'.xls', '.xlsx'}:
                 df = pd.read_excel(self.filepath)
             elif suffix == '.ods':
@@ -4,17 +4,32 @@ graph_generator.py - Enhanced Graph Generation Module for Compgrapher
 This module provides configurable graph generation with statistics calculation,
 multiple output formats, and comprehensive reporting capabilities.
 """
+import base64
 import io
+import math
 import os
 import logging
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from chart_utils import (
+    HTML_WRITE_BUFFER,
+    PIL_FORMATS,
+    PNG_COMPRESS_LEVEL,
+    bar_geometry,
+    tight_bbox,
+    write_raster,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +46,15 @@ class GraphConfig:
     # Figure settings
     figure_width: float = 10.0
     figure_height: float = 8.0
-    dpi: int = 300
+    # Raster resolution; 150 keeps 8pt labels crisp at a quarter of the
+    # pixels 300 dpi would render (SVG/PDF/EPS are unaffected)
+    dpi: int = 150
+    # JPEG chroma subsampling blurs fine detail anyway, so JPEGs are capped
+    # at this resolution when dpi is raised (and use dpi when it is lower)
+    jpeg_dpi: int = 150
+    # Upper bound on pixels per rendered chart; larger figure/dpi combinations
+    # get their dpi lowered rather than allocating a huge framebuffer
+    max_raster_pixels: int = 40_000_000
     
     # Labels
     xlabel: str = 'Location'
@@ -40,6 +63,17 @@ class GraphConfig:
     # Grid and styling
     show_grid: bool = True
     show_labels: bool = False
+    # Skip per-bar labels on charts with more bars than this
+    label_budget: int = 200
+    # Emit bars as a single raster image inside vector outputs (SVG/PDF/EPS)
+    rasterize_bars: bool = False
+    # Worker processes for image charts; 1 renders everything in-process
+    workers: int = 1
+    
+    # HTML report charts are inline SVG by default.  Set a dpi to embed small
+    # JPEG thumbnails instead, or disable charts for a table-only report.
+    html_charts: bool = True
+    html_thumbnail_dpi: Optional[int] = None
     bar_width: float = 0.8
     
     # Output settings
@@ -72,6 +106,157 @@ class PositionStats:
         }
 
 
+# Static parts of the HTML report, filled in with str.format
+HTML_REPORT_HEADER = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Compensation Analysis Report - {client_name}</title>
+    <style>
+        body {{
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+            text-align: center;
+        }}
+        .position-card {{
+            background: white;
+            border-radius: 8px;
+            padding: 20px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        .position-title {{
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 15px;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 10px;
+        }}
+        .chart-container {{
+            text-align: center;
+            margin: 20px 0;
+        }}
+        .salary-table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+        }}
+        .salary-table th, .salary-table td {{
+            border: 1px solid #ddd;
+            padding: 8px 12px;
+            text-align: left;
+        }}
+        .salary-table th {{
+            background-color: #f8f9fa;
+            font-weight: bold;
+        }}
+        .client-row {{
+            background-color: #e8f4fd;
+            font-weight: bold;
+        }}
+        .salary-range {{
+            font-family: 'Courier New', monospace;
+            font-weight: bold;
+        }}
+        .summary {{
+            background: #ecf0f1;
+            padding: 20px;
+            border-radius: 8px;
+            margin-top: 30px;
+        }}
+        .stats {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 15px;
+            margin-top: 15px;
+        }}
+        .stat-box {{
+            background: white;
+            padding: 15px;
+            border-radius: 5px;
+            text-align: center;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        }}
+        .stat-value {{
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #3498db;
+        }}
+        .stat-label {{
+            color: #7f8c8d;
+            font-size: 0.9em;
+        }}
+        .position-stats {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
+            gap: 10px;
+            margin: 15px 0;
+            padding: 15px;
+            background: #f8f9fa;
+            border-radius: 5px;
+        }}
+        .position-stat {{
+            text-align: center;
+        }}
+        .position-stat-value {{
+            font-weight: bold;
+            color: #2c3e50;
+        }}
+        .position-stat-label {{
+            font-size: 0.8em;
+            color: #7f8c8d;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Compensation Analysis Report</h1>
+        <h2>Client: {client_name}</h2>
+        <p>Generated on {timestamp}</p>
+        <p>Data source: {data_source}</p>
+    </div>
+
+    <div class="summary">
+        <h2>Report Summary</h2>
+        <div class="stats">
+            <div class="stat-box">
+                <div class="stat-value">{position_count}</div>
+                <div class="stat-label">Positions Analyzed</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-value">{employer_count}</div>
+                <div class="stat-label">Employers Compared</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-value">${salary_min:,.0f} - ${salary_max:,.0f}</div>
+                <div class="stat-label">Salary Range</div>
+            </div>
+        </div>
+    </div>
+
+    <h2>Position Details</h2>
+'''
+
+HTML_REPORT_FOOTER = '''
+</body>
+</html>
+'''
+
+
 class GraphGenerator:
     """
     Enhanced graph generator with statistics and multiple output formats.
@@ -161,17 +346,78 @@ class GraphGenerator:
         
         # Generate image graphs
         if image_formats:
-            files = self._generate_image_graphs(df, image_formats, show_progress)
+            if self.config.workers > 1:
+                files = self._generate_image_graphs_parallel(
+                    df, image_formats, show_progress
+                )
+            else:
+                files = self._generate_image_graphs(df, image_formats, show_progress)
             generated_files.extend(files)
         
         # Generate HTML report
         if 'html' in output_formats:
-            html_file = self._generate_html_report(df, client_name, input_file)
+            html_file = self._generate_html_report(
+                df, client_name, input_file, link_png='png' in image_formats
+            )
             generated_files.append(html_file)
         
         logger.info(f"Generated {len(generated_files)} files")
         return generated_files
     
+    def _generate_image_graphs_parallel(
+        self,
+        df: pd.DataFrame,
+        formats: List[str],
+        show_progress: bool = False
+    ) -> List[str]:
+        """
+        Generate image format graphs across worker processes.
+        
+        Positions are split into contiguous batches, one per worker, so the
+        returned paths keep the same order as a serial run.
+        
+        Args:
+            df: DataFrame with salary data
+            formats: Image format extensions to generate
+            show_progress: Whether to log progress as batches finish
+            
+        Returns:
+            List of generated file paths
+        """
+        positions = sorted(df[self.TITLE].dropna().unique())
+        workers = min(self.config.workers, len(positions))
+        if workers <= 1:
+            return self._generate_image_graphs(df, formats, show_progress)
+        
+        # Apply the pixel budget once here so the workers neither repeat the
+        # check nor each log the same warning
+        config = replace(
+            self.config,
+            dpi=self._capped_dpi(self.config.dpi),
+            jpeg_dpi=self._capped_dpi(self.config.jpeg_dpi)
+        )
+        batches = np.array_split(np.array(positions, dtype=object), workers)
+        generated_files = []
+        done = 0
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_render_worker
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _render_image_batch,
+                    config,
+                    df[df[self.TITLE].isin(batch)],
+                    formats
+                )
+                for batch in batches
+            ]
+            for batch, future in zip(batches, futures):
+                generated_files.extend(future.result())
+                done += len(batch)
+                if show_progress:
+                    logger.info(f"Processed {done}/{len(positions)} positions")
+        return generated_files
+    
     def _generate_image_graphs(
         self,
         df: pd.DataFrame,
@@ -180,53 +426,55 @@ class GraphGenerator:
     ) -> List[str]:
         """Generate image format graphs"""
         generated_files = []
+        # Sort once by (position, max salary) rather than once per group;
+        # groupby preserves the row order within each group.
+        df = df.sort_values(by=[self.TITLE, self.SAL_MAX], kind='stable')
         groups = list(df.groupby(self.TITLE))
+        dpi = self._capped_dpi(self.config.dpi)
+        # jpeg_dpi only caps JPEG resolution; it never raises it above dpi
+        jpeg_dpi = min(dpi, self._capped_dpi(self.config.jpeg_dpi))
+        # Render rasters at full dpi unless JPEG is the only raster output
+        raster_dpi = dpi if {'png', 'webp'} & set(formats) else jpeg_dpi
+        # Create each format's directory once rather than once per chart
+        output_dirs = {fmt: Path(self.config.output_dir) / fmt for fmt in formats}
+        for output_dir in output_dirs.values():
+            output_dir.mkdir(parents=True, exist_ok=True)
         
         for i, (name, group) in enumerate(groups):
             if show_progress:
                 logger.info(f"Processing {i+1}/{len(groups)}: {name}")
             
             safe_name = name.replace('/', '_')
-            group = group.sort_values(by=self.SAL_MAX, ascending=True)
             
             # Create figure
             fig, ax = plt.subplots(figsize=(self.config.figure_width, self.config.figure_height))
             
             # Calculate bar heights
-            heights = group[self.SAL_MAX] - group[self.SAL_MIN]
-            linewidths = [3 if h == 0 else 1 for h in heights]
-
-            # Calculate proportional thickness for zero-height bars (2% of y-axis range)
-            all_salaries = pd.concat([group[self.SAL_MIN], group[self.SAL_MAX]])
-            y_range = all_salaries.max() - all_salaries.min()
-            ZERO_BAR_THICKNESS_RATIO = 0.02  # 2% of y-axis range
-            zero_bar_height = y_range * ZERO_BAR_THICKNESS_RATIO if y_range > 0 else 1.0
-            adjusted_heights = [zero_bar_height if h == 0 else h for h in heights]
+            lows = group[self.SAL_MIN].to_numpy(dtype=float)
+            highs = group[self.SAL_MAX].to_numpy(dtype=float)
+            adjusted_heights, linewidths = bar_geometry(lows, highs)
 
             # Draw bars
             bars = ax.bar(
                 group[self.LOCATION],
                 adjusted_heights,
-                bottom=group[self.SAL_MIN],
+                bottom=lows,
                 color=group[self.COLOR],
                 edgecolor=self.config.edge_color,
                 linewidth=linewidths,
                 zorder=3,
-                width=self.config.bar_width
+                width=self.config.bar_width,
+                rasterized=self.config.rasterize_bars
             )
             
             # Add labels if configured
-            if self.config.show_labels:
-                for bar, (_, row) in zip(bars, group.iterrows()):
-                    height = bar.get_height()
-                    ax.annotate(
-                        f'${row[self.SAL_MAX]:,.0f}',
-                        xy=(bar.get_x() + bar.get_width() / 2, bar.get_y() + height),
-                        xytext=(0, 3),
-                        textcoords='offset points',
-                        ha='center', va='bottom',
-                        fontsize=8
-                    )
+            if self.config.show_labels and len(bars) <= self.config.label_budget:
+                ax.bar_label(
+                    bars,
+                    labels=[f'${high:,.0f}' for high in highs],
+                    padding=3,
+                    fontsize=8
+                )
             
             # Configure axes
             ax.set_ylabel(self.config.ylabel)
@@ -240,65 +488,183 @@ class GraphGenerator:
             plt.xticks(rotation=60, ha='right', fontsize=8)
             plt.tight_layout()
             
-            # Save in each format
+            # Save in each format, reusing one tight bounding box measured
+            # at the main output resolution
+            fig.set_dpi(dpi)
+            bbox = tight_bbox(fig)
+            png_bytes = None
             for fmt in formats:
-                output_dir = Path(self.config.output_dir) / fmt
-                output_dir.mkdir(parents=True, exist_ok=True)
-                filepath = output_dir / f"{safe_name}.{fmt}"
-                fig.savefig(filepath, dpi=self.config.dpi, bbox_inches='tight')
+                filepath = output_dirs[fmt] / f"{safe_name}.{fmt}"
+                if fmt != 'png' and fmt not in PIL_FORMATS:
+                    fig.savefig(filepath, dpi=dpi, bbox_inches=bbox)
+                else:
+                    # Draw the raster once; every raster format reuses it
+                    if png_bytes is None:
+                        buffer = io.BytesIO()
+                        fig.savefig(
+                            buffer,
+                            format='png',
+                            dpi=raster_dpi,
+                            bbox_inches=bbox,
+                            pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL}
+                        )
+                        png_bytes = buffer.getvalue()
+                    out_dpi = jpeg_dpi if fmt in ('jpg', 'jpeg') else raster_dpi
+                    write_raster(
+                        png_bytes, filepath, fmt,
+                        scale=out_dpi / raster_dpi,
+                        dpi=out_dpi
+                    )
                 generated_files.append(str(filepath))
             
             plt.close(fig)
         
         return generated_files
     
+    def _capped_dpi(self, dpi: int) -> int:
+        """
+        Lower *dpi* so a figure of the configured size stays within
+        ``max_raster_pixels``.
+        
+        Args:
+            dpi: Requested resolution
+            
+        Returns:
+            The requested dpi, or the largest whole dpi that fits the pixel
+            budget
+        """
+        figure_area = self.config.figure_width * self.config.figure_height
+        max_dpi = int(math.sqrt(self.config.max_raster_pixels / figure_area))
+        if dpi <= max_dpi:
+            return dpi
+        logger.warning(
+            f"Lowering dpi from {dpi} to {max_dpi} to keep "
+            f"{self.config.figure_width}x{self.config.figure_height}in charts "
+            f"under {self.config.max_raster_pixels:,} pixels"
+        )
+        return max_dpi
+    
+    def _generate_chart_html(
+        self,
+        group: pd.DataFrame,
+        name: str,
+        safe_name: str,
+        link_png: bool = False
+    ) -> str:
+        """
+        Generate the chart markup for a position card in the HTML report.
+        
+        Args:
+            group: DataFrame group for a single position, sorted by max salary
+            name: Position name (used as chart title)
+            safe_name: Position name as used in output file names
+            link_png: Whether this run wrote PNG charts that thumbnails
+                can link to
+            
+        Returns:
+            Inline SVG, a thumbnail ``<img>``, or an empty string when
+            charts are disabled
+        """
+        if not self.config.html_charts:
+            return ''
+        if self.config.html_thumbnail_dpi is None:
+            return self._generate_chart_svg(group, name)
+        return self._generate_chart_thumbnail(group, name, safe_name, link_png)
+    
+    def _generate_chart_thumbnail(
+        self,
+        group: pd.DataFrame,
+        name: str,
+        safe_name: str,
+        link_png: bool = False
+    ) -> str:
+        """
+        Generate a low-resolution JPEG chart embedded as an ``<img>`` tag.
+        
+        Args:
+            group: DataFrame group for a single position, sorted by max salary
+            name: Position name (used as chart title)
+            safe_name: Position name as used in output file names
+            link_png: Whether to link the full-resolution PNG written by
+                this run
+            
+        Returns:
+            ``<img>`` tag with a data URI, followed by a link to the
+            full-resolution PNG when one was generated
+        """
+        fig = self._draw_chart(group, name)
+        buf = io.BytesIO()
+        fig.savefig(
+            buf,
+            format='jpg',
+            dpi=self.config.html_thumbnail_dpi,
+            bbox_inches='tight',
+            pil_kwargs={'quality': 80, 'optimize': True}
+        )
+        plt.close(fig)
+        encoded = base64.b64encode(buf.getvalue()).decode('ascii')
+        markup = f'<img src="data:image/jpeg;base64,{encoded}" alt="{name}" style="max-width: 100%;">'
+        
+        if link_png:
+            markup += f'\n            <p><a href="../png/{quote(safe_name)}.png">Full resolution</a></p>'
+        return markup
+    
     def _generate_chart_svg(self, group: pd.DataFrame, name: str) -> str:
         """
         Generate a chart for a position group and return it as an inline SVG string.
         
         Args:
-            group: DataFrame group for a single position
+            group: DataFrame group for a single position, sorted by max salary
             name: Position name (used as chart title)
             
         Returns:
             Inline SVG string (the <svg>...</svg> element, no XML declaration)
         """
-        group = group.sort_values(by=self.SAL_MAX, ascending=True)
+        fig = self._draw_chart(group, name)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='svg', bbox_inches='tight')
+        plt.close(fig)
+        buf.seek(0)
+        svg_string = buf.read().decode('utf-8')
+        # Strip XML declaration, keep just the <svg>...</svg> element
+        return svg_string[svg_string.find('<svg'):]
+    
+    def _draw_chart(self, group: pd.DataFrame, name: str):
+        """
+        Draw the report chart for a position group on a new figure.
         
+        Args:
+            group: DataFrame group for a single position, sorted by max salary
+            name: Position name (used as chart title)
+            
+        Returns:
+            The matplotlib Figure; the caller saves and closes it
+        """
         fig, ax = plt.subplots(figsize=(self.config.figure_width, self.config.figure_height))
         
-        heights = group[self.SAL_MAX] - group[self.SAL_MIN]
-        linewidths = [3 if h == 0 else 1 for h in heights]
-
-        # Calculate proportional thickness for zero-height bars (2% of y-axis range)
-        all_salaries = pd.concat([group[self.SAL_MIN], group[self.SAL_MAX]])
-        y_range = all_salaries.max() - all_salaries.min()
-        ZERO_BAR_THICKNESS_RATIO = 0.02  # 2% of y-axis range
-        zero_bar_height = y_range * ZERO_BAR_THICKNESS_RATIO if y_range > 0 else 1.0
-        adjusted_heights = [zero_bar_height if h == 0 else h for h in heights]
+        lows = group[self.SAL_MIN].to_numpy(dtype=float)
+        highs = group[self.SAL_MAX].to_numpy(dtype=float)
+        adjusted_heights, linewidths = bar_geometry(lows, highs)
 
         bars = ax.bar(
             group[self.LOCATION],
             adjusted_heights,
-            bottom=group[self.SAL_MIN],
+            bottom=lows,
             color=group[self.COLOR],
             edgecolor=self.config.edge_color,
             linewidth=linewidths,
             zorder=3,
-            width=self.config.bar_width
+            width=self.config.bar_width,
+            rasterized=self.config.rasterize_bars
         )
         
-        if self.config.show_labels:
-            for bar, (_, row) in zip(bars, group.iterrows()):
-                height = bar.get_height()
-                ax.annotate(
-                    f'${row[self.SAL_MAX]:,.0f}',
-                    xy=(bar.get_x() + bar.get_width() / 2, bar.get_y() + height),
-                    xytext=(0, 3),
-                    textcoords='offset points',
-                    ha='center', va='bottom',
-                    fontsize=8
-                )
+        if self.config.show_labels and len(bars) <= self.config.label_budget:
+            ax.bar_label(
+                bars,
+                labels=[f'${high:,.0f}' for high in highs],
+                padding=3,
+                fontsize=8
+            )
         
         ax.set_ylabel(self.config.ylabel)
         ax.set_xlabel(self.config.xlabel)
@@ -309,20 +675,14 @@ class GraphGenerator:
         
         plt.xticks(rotation=60, ha='right', fontsize=8)
         plt.tight_layout()
-        
-        buf = io.BytesIO()
-        fig.savefig(buf, format='svg', bbox_inches='tight')
-        plt.close(fig)
-        buf.seek(0)
-        svg_string = buf.read().decode('utf-8')
-        # Strip XML declaration, keep just the <svg>...</svg> element
-        return svg_string[svg_string.find('<svg'):]
+        return fig
 
     def _generate_html_report(
         self,
         df: pd.DataFrame,
         client_name: str,
-        input_file: str
+        input_file: str,
+        link_png: bool = False
     ) -> str:
         """Generate comprehensive HTML report with embedded charts"""
         logger.info("Generating HTML report")
@@ -330,198 +690,61 @@ class GraphGenerator:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         position_summaries = []
         
+        # Sort once, then take each position's rows as plain column lists
+        # instead of building a dict per row with iterrows()
+        df = df.sort_values(by=[self.TITLE, self.SAL_MAX], kind='stable')
         for position_name, group in df.groupby(self.TITLE):
             safe_name = position_name.replace('/', '_')
-            sorted_group = group.sort_values(by=self.SAL_MAX, ascending=True)
-            
-            employers_data = []
-            for _, row in sorted_group.iterrows():
-                employers_data.append({
-                    'employer': row[self.LOCATION],
-                    'min_salary': row[self.SAL_MIN],
-                    'max_salary': row[self.SAL_MAX],
-                    'is_client': client_name in row[self.LOCATION]
-                })
+            employers = group[self.LOCATION].tolist()
             
-            chart_svg = self._generate_chart_svg(group, position_name)
+            chart_svg = self._generate_chart_html(group, position_name, safe_name, link_png)
             
             stats = self.stats.get(position_name)
             position_summaries.append({
                 'name': position_name,
                 'safe_name': safe_name,
-                'employers': employers_data,
+                'employers': employers,
+                'min_salaries': group[self.SAL_MIN].tolist(),
+                'max_salaries': group[self.SAL_MAX].tolist(),
+                'is_client': [client_name in employer for employer in employers],
                 'chart_svg': chart_svg,
                 'stats': stats
             })
         
-        html_content = self._build_html_content(
-            position_summaries, df, client_name, timestamp, input_file
-        )
-        
-        # Save HTML file
+        # Save HTML file, streaming fragments instead of building one string
         output_dir = Path(self.config.output_dir) / 'html'
         output_dir.mkdir(parents=True, exist_ok=True)
         html_filename = f"compensation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
         html_path = output_dir / html_filename
         
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(html_path, 'w', encoding='utf-8', buffering=HTML_WRITE_BUFFER) as f:
+            f.writelines(self._iter_html_content(
+                position_summaries, df, client_name, timestamp, input_file
+            ))
         
         logger.info(f"HTML report saved to: {html_path}")
         return str(html_path)
     
-    def _build_html_content(
+    def _iter_html_content(
         self,
         position_summaries: List[Dict],
         df: pd.DataFrame,
         client_name: str,
         timestamp: str,
         input_file: str
-    ) -> str:
-        """Build the HTML content string"""
-        html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Compensation Analysis Report - {client_name}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            text-align: center;
-        }}
-        .position-card {{
-            background: white;
-            border-radius: 8px;
-            padding: 20px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .position-title {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 15px;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        .chart-container {{
-            text-align: center;
-            margin: 20px 0;
-        }}
-        .salary-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }}
-        .salary-table th, .salary-table td {{
-            border: 1px solid #ddd;
-            padding: 8px 12px;
-            text-align: left;
-        }}
-        .salary-table th {{
-            background-color: #f8f9fa;
-            font-weight: bold;
-        }}
-        .client-row {{
-            background-color: #e8f4fd;
-            font-weight: bold;
-        }}
-        .salary-range {{
-            font-family: 'Courier New', monospace;
-            font-weight: bold;
-        }}
-        .summary {{
-            background: #ecf0f1;
-            padding: 20px;
-            border-radius: 8px;
-            margin-top: 30px;
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-top: 15px;
-        }}
-        .stat-box {{
-            background: white;
-            padding: 15px;
-            border-radius: 5px;
-            text-align: center;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .stat-value {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #3498db;
-        }}
-        .stat-label {{
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-        .position-stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-            gap: 10px;
-            margin: 15px 0;
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 5px;
-        }}
-        .position-stat {{
-            text-align: center;
-        }}
-        .position-stat-value {{
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        .position-stat-label {{
-            font-size: 0.8em;
-            color: #7f8c8d;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Compensation Analysis Report</h1>
-        <h2>Client: {client_name}</h2>
-        <p>Generated on {timestamp}</p>
-        <p>Data source: {os.path.basename(input_file)}</p>
-    </div>
-
-    <div class="summary">
-        <h2>Report Summary</h2>
-        <div class="stats">
-            <div class="stat-box">
-                <div class="stat-value">{len(position_summaries)}</div>
-                <div class="stat-label">Positions Analyzed</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-value">{len(set(emp['employer'] for pos in position_summaries for emp in pos['employers']))}</div>
-                <div class="stat-label">Employers Compared</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-value">${df[self.SAL_MIN].min():,.0f} - ${df[self.SAL_MAX].max():,.0f}</div>
-                <div class="stat-label">Salary Range</div>
-            </div>
-        </div>
-    </div>
-
-    <h2>Position Details</h2>
-'''
+    ) -> Iterator[str]:
+        """Yield the HTML report in order, one fragment at a time"""
+        yield HTML_REPORT_HEADER.format(
+            client_name=client_name,
+            timestamp=timestamp,
+            data_source=os.path.basename(input_file),
+            position_count=len(position_summaries),
+            employer_count=len(set(
+                employer for pos in position_summaries for employer in pos['employers']
+            )),
+            salary_min=df[self.SAL_MIN].min(),
+            salary_max=df[self.SAL_MAX].max(),
+        )
 
         for position in position_summaries:
             stats = position.get('stats')
@@ -552,13 +775,18 @@ class GraphGenerator:
         </div>
 '''
 
-            html_content += f'''
+            # Table-only reports (html_charts=False) get no chart box at all
+            chart_html = ''
+            if position['chart_svg']:
+                chart_html = f'''<div class="chart-container">
+            {position['chart_svg']}
+        </div>'''
+
+            yield f'''
     <div class="position-card">
         <div class="position-title">{position['name']}</div>
         {stats_html}
-        <div class="chart-container">
-            {position['chart_svg']}
-        </div>
+        {chart_html}
 
         <table class="salary-table">
             <thead>
@@ -572,28 +800,29 @@ class GraphGenerator:
             <tbody>
 '''
 
-            for employer in position['employers']:
-                row_class = 'client-row' if employer['is_client'] else ''
-                html_content += f'''
+            for employer, min_salary, max_salary, is_client in zip(
+                position['employers'],
+                position['min_salaries'],
+                position['max_salaries'],
+                position['is_client']
+            ):
+                row_class = 'client-row' if is_client else ''
+                yield f'''
                 <tr class="{row_class}">
-                    <td>{employer['employer']}</td>
-                    <td>${employer['min_salary']:,.0f}</td>
-                    <td>${employer['max_salary']:,.0f}</td>
-                    <td class="salary-range">${employer['min_salary']:,.0f} - ${employer['max_salary']:,.0f}</td>
+                    <td>{employer}</td>
+                    <td>${min_salary:,.0f}</td>
+                    <td>${max_salary:,.0f}</td>
+                    <td class="salary-range">${min_salary:,.0f} - ${max_salary:,.0f}</td>
                 </tr>
 '''
 
-            html_content += '''
+            yield '''
             </tbody>
         </table>
     </div>
 '''
 
-        html_content += '''
-</body>
-</html>
-'''
-        return html_content
+        yield HTML_REPORT_FOOTER
     
     def generate_summary_report(self, output_path: Optional[str] = None) -> str:
         """
@@ -641,6 +870,20 @@ class GraphGenerator:
         return report
 
 
+def _init_render_worker() -> None:
+    """Select the non-interactive Agg backend in a fresh worker process."""
+    matplotlib.use('Agg')
+
+
+def _render_image_batch(
+    config: GraphConfig,
+    df: pd.DataFrame,
+    formats: List[str]
+) -> List[str]:
+    """Render one batch of positions in a worker process."""
+    return GraphGenerator(config)._generate_image_graphs(df, formats)
+
+
 # Example usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -1,14 +1,26 @@
 import io
-import math
 import os
 import re
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering; charts are only ever saved to disk
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from chart_utils import (  # noqa: E402
+    HTML_WRITE_BUFFER,
+    PIL_FORMATS,
+    PNG_COMPRESS_LEVEL,
+    bar_geometry,
+    tight_bbox,
+    write_raster,
+)
 
 
 class FriendlyArgumentParser(argparse.ArgumentParser):
@@ -43,21 +55,59 @@ sal_min = 'salary_min'
 sal_max = 'salary_max'
 title = 'POSITION TITLE'
 
+# Input file extensions process() can read
+SUPPORTED_EXTENSIONS = frozenset({'.csv', '.xls', '.xlsx', '.ods'})
+
+# Report summary columns that are not employer data
+SUMMARY_COLUMNS = frozenset({
+    "Comp Data Points",
+    "Comp Average",
+    "Comp Lo-Hi Range",
+    "Comp Median",
+    "75th Percent of Market",
+    "% Melrose Higher Lower than 75th Percentile",
+})
+
 # Keywords that indicate a job is paid per-inspection rather than hourly
 PER_INSPECTION_INDICATORS = ['per', 'inspection', 'fee', 'paid']
 
-
-def is_per_inspection(value) -> bool:
-    """Return True if a cell value signals per-inspection (not hourly) pay."""
-    if value is None:
-        return False
+# Patterns used when classifying and converting salary cells, compiled once
+PER_INSPECTION_RE = re.compile('|'.join(re.escape(ind) for ind in PER_INSPECTION_INDICATORS))
+SALARY_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+NUMERIC_CELL_RE = re.compile(r'\$?\s*[\d,]+\.?\d*')
+DONE_BY_RE = re.compile(r'done\s+by\s*', re.IGNORECASE)
+# Spellings the C CSV parser reads as booleans, passed to pyarrow so both
+# engines infer the same column types
+CSV_TRUE_VALUES = ['True', 'TRUE', 'true']
+CSV_FALSE_VALUES = ['False', 'FALSE', 'false']
+# Translation table stripping currency formatting ('$1,234' -> '1234')
+CURRENCY_CHARS = str.maketrans('', '', '$,')
+
+# Charts with more bars than this skip per-bar value labels even when
+# --show-labels is set; the text layout dominates render and save time.
+LABEL_BUDGET = 200
+
+# Threads writing PNG bytes and running Pillow encodes while the next chart
+# renders; both release the GIL inside their C encoders
+RASTER_SAVE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Bar colours shared by the static charts and the HTML report, spelled out as
+# full '#rrggbb' so matplotlib and Chart.js receive identical values
+CLIENT_COLOR = '#e8f4fd'
+DEFAULT_COLOR = '#ffffff'
+# Outline / tick-label accent for the client, and outline for everyone else
+CLIENT_ACCENT_COLOR = '#1565C0'
+DEFAULT_BORDER_COLOR = '#333333'
+
+
+def parses_as_float(text: str) -> bool:
+    """Return True if ``float()`` accepts *text*."""
     try:
-        if math.isnan(float(value)):
-            return False
-    except (ValueError, TypeError):
-        pass
-    s = str(value).strip().lower()
-    return any(indicator in s for indicator in PER_INSPECTION_INDICATORS)
+        float(text)
+    except ValueError:
+        return False
+    return True
+
 
 def format_per_inspection_rate(rates):
     """Format a list of numeric inspection rates into a display string."""
@@ -69,10 +119,13 @@ def format_per_inspection_rate(rates):
     return f"${min(unique):,.2f} \u2013 ${max(unique):,.2f} per inspection"
 
 
+@lru_cache(maxsize=4096)
 def classify_special_status(combined_text: str) -> tuple:
     """
     Given a combined string assembled from all non-numeric cell values for a
     single (position, employer) pair, determine the special status type.
+    Cached because the same few notes ("Outsourced", "See …") repeat across
+    many positions and employers.
 
     Returns a 3-tuple ``(status_type, display_text, reference)`` where:
 
@@ -102,12 +155,21 @@ def classify_special_status(combined_text: str) -> tuple:
         return ('see', ref, ref)
 
     if 'done by' in tl:
-        ref = re.sub(r'(?i)done\s+by\s*', '', t).strip()
+        ref = DONE_BY_RE.sub('', t).strip()
         return ('done_by', ref, ref if ref else None)
 
     return (None, t, None)
 
 
+@lru_cache(maxsize=None)
+def position_name_words(position_name: str) -> Tuple[str, ...]:
+    """
+    Return the lower-cased words of *position_name*, treating ``/`` and ``&``
+    as separators.  Cached because every badge lookup scans every position.
+    """
+    return tuple(position_name.lower().replace('/', ' ').replace('&', ' ').split())
+
+
 def find_position_match(reference: str, position_names: List[str]) -> Optional[str]:
     """
     Try to find a position name in *position_names* that best matches the
@@ -135,7 +197,7 @@ def find_position_match(reference: str, position_names: List[str]) -> Optional[s
     best_match = None
     best_score = 0
     for pos in position_names:
-        pos_words = pos.lower().replace('/', ' ').replace('&', ' ').split()
+        pos_words = position_name_words(pos)
         score = sum(
             1 for rw in ref_words
             if any(pw.startswith(rw) or rw.startswith(pw) for pw in pos_words)
@@ -148,10 +210,11 @@ def find_position_match(reference: str, position_names: List[str]) -> Optional[s
     return best_match if best_score >= threshold else None
 
 
-def render_special_status_badge(ss_info: dict, position_summaries: list) -> str:
+def render_special_status_badge(ss_info: dict, position_names: List[str]) -> str:
     """
     Return an HTML string (a styled ``<span>`` badge) for the given special
-    status.  For ``'see'`` type, attempt to link to the referenced position.
+    status.  For ``'see'`` type, attempt to link to the referenced position
+    among *position_names*.
     """
     status_type = ss_info['type']
     display     = ss_info['display']
@@ -173,9 +236,7 @@ def render_special_status_badge(ss_info: dict, position_summaries: list) -> str:
 
     if status_type == 'see':
         if reference and reference.lower() != 'above':
-            matched = find_position_match(
-                reference, [p['name'] for p in position_summaries]
-            )
+            matched = find_position_match(reference, position_names)
             if matched:
                 safe = matched.replace('/', '_')
                 return (
@@ -189,9 +250,7 @@ def render_special_status_badge(ss_info: dict, position_summaries: list) -> str:
 
     if status_type == 'done_by':
         if reference:
-            matched = find_position_match(
-                reference, [p['name'] for p in position_summaries]
-            )
+            matched = find_position_match(reference, position_names)
             if matched:
                 safe = matched.replace('/', '_')
                 return (
@@ -206,32 +265,95 @@ def render_special_status_badge(ss_info: dict, position_summaries: list) -> str:
     return f'<span class="status-badge badge-unknown">&#8505; {display}</span>'
 
 
+def read_csv_header(file_path: str) -> Tuple[List[str], int]:
+    """
+    Return the column names of a CSV file and the row they sit on.
+
+    Some exports put a row of blank or unnamed cells above the real header;
+    in that case the header is taken from the next row.  Only the header is
+    parsed (``nrows=0``), not the data.
+    """
+    columns = pd.read_csv(file_path, nrows=0).columns.tolist()
+    if all('Unnamed' in col or col.strip() == '' for col in columns):
+        return pd.read_csv(file_path, skiprows=1, nrows=0).columns.tolist(), 1
+    return columns, 0
+
+
+def is_data_column(column) -> bool:
+    """Return False for report summary columns, which are never charted."""
+    return column not in SUMMARY_COLUMNS
+
+
+def read_csv_text_column(file_path: str, header_row: int, index: int) -> List[str]:
+    """
+    Read one CSV column as raw text through pyarrow, with no null or type
+    detection, the way ``converters={col: str}`` reads it on the C parser.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    name = f'f{index}'
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(skip_rows=header_row + 1,
+                                        autogenerate_column_names=True),
+        convert_options=pa_csv.ConvertOptions(include_columns=[name],
+                                              column_types={name: pa.string()},
+                                              strings_can_be_null=False),
+    )
+    values: List[str] = table.column(name).to_pylist()
+    return values
+
+
+def read_csv_data(file_path: str, header_row: int = 0) -> pd.DataFrame:
+    """
+    Read a compensation CSV, using the multithreaded pyarrow parser when it
+    is installed and falling back to the C parser otherwise.  The C parser
+    reads the file through a memory map rather than buffered reads.
+    """
+    try:
+        # pyarrow mishandles skiprows together with a header; point at the
+        # header row directly instead.  Its default boolean spellings include
+        # '1'/'0', so pass the C parser's set to infer the same types.
+        df = pd.read_csv(file_path, engine='pyarrow', header=header_row,
+                         true_values=CSV_TRUE_VALUES, false_values=CSV_FALSE_VALUES)
+    except (ImportError, ValueError):
+        return pd.read_csv(file_path, converters={title: str}, skiprows=header_row,
+                           header=0, low_memory=False, usecols=is_data_column,
+                           memory_map=True)
+    # pyarrow leaves blank headers empty and repeats unchanged; take the
+    # names from pandas' own header parse so both engines agree.  It also
+    # rejects a callable usecols, so summary columns are left for
+    # remove_summary_columns().
+    df.columns = pd.read_csv(file_path, skiprows=header_row, nrows=0).columns
+    if title in df.columns:
+        # pyarrow has no converters, and its type and null inference would
+        # turn titles like 'N/A' or '1' into NaN or 1.0; reread the title
+        # column as raw text to match the C path's str converter
+        df[title] = read_csv_text_column(file_path, header_row, df.columns.get_loc(title))
+    return df
+
+
 def read_data(file_path: str, ext: str, header_row: int = 0) -> pd.DataFrame:
     """Read a compensation data file into a DataFrame."""
     converters = {title: str}
     if ext == '.csv':
-        return pd.read_csv(file_path, converters=converters, skiprows=header_row, header=0)
+        return read_csv_data(file_path, header_row)
     elif ext in ['.xls', '.xlsx']:
-        return pd.read_excel(file_path, converters=converters, header=header_row)
+        return pd.read_excel(file_path, converters=converters, header=header_row,
+                             usecols=is_data_column)
     elif ext == '.ods':
-        return pd.read_excel(file_path, engine='odf', converters=converters, header=header_row)
+        return pd.read_excel(file_path, engine='odf', converters=converters, header=header_row,
+                             usecols=is_data_column)
     else:
         raise ValueError(f"Unsupported file format: {ext}")
 
 
 def remove_summary_columns(df):
-    bad_columns = [
-        "Comp Data Points",
-        "Comp Average",
-        "Comp Lo-Hi Range",
-        "Comp Median",
-        "75th Percent of Market",
-        "% Melrose Higher Lower than 75th Percentile"
-    ]
-    for c in bad_columns:
-        df = df.drop(c, axis=1, errors='ignore')
-
-    return df
+    # read_data() already skips summary columns where the parser allows it;
+    # this catches the rest.  A single drop instead of one full DataFrame
+    # copy per summary column.
+    return df.drop(columns=[c for c in df.columns if c in SUMMARY_COLUMNS])
 
 
 def combine_lines(df):
@@ -262,21 +384,19 @@ def make_city_column(df):
         var_name=location
     ).dropna()
 
+    # String view of every cell, computed once and shared by the vectorised
+    # classification masks below (melt's dropna() already removed NaN cells).
+    cell_text = melted[salary].astype(str).str.strip()
+    lowered = cell_text.str.lower()
+
     # Detect per-inspection rows BEFORE numeric coercion, then drop them from
     # the hourly dataset so they never appear as a numeric bar in the chart.
+    per_inspection_mask = lowered.str.contains(PER_INSPECTION_RE)
     per_inspection_raw = {}  # {position: {employer: [raw_strings]}}
-    per_inspection_indices = []
-    for idx, row in melted.iterrows():
-        if is_per_inspection(row[salary]):
-            pos = row[title]
-            emp = row[location]
-            per_inspection_raw.setdefault(pos, {}).setdefault(emp, []).append(
-                str(row[salary]).strip()
-            )
-            per_inspection_indices.append(idx)
-
-    # Remove per-inspection rows from the hourly data entirely
-    melted = melted.drop(index=per_inspection_indices)
+    for pos, emp, raw in zip(melted.loc[per_inspection_mask, title],
+                             melted.loc[per_inspection_mask, location],
+                             cell_text[per_inspection_mask]):
+        per_inspection_raw.setdefault(pos, {}).setdefault(emp, []).append(raw)
 
     # Build per_inspection dict: extract numeric rates from raw strings.
     # Also detect "fee paid" entries (cells containing "fee"/"paid" but not
@@ -287,7 +407,7 @@ def make_city_column(df):
         for emp, raw_values in employers.items():
             rates = []
             for v in raw_values:
-                nums = re.findall(r'\d+\.?\d*', v)
+                nums = SALARY_NUMBER_RE.findall(v)
                 rates.extend(float(n) for n in nums)
             combined_raw = ' '.join(raw_values).lower()
             has_per_or_inspection = 'per' in combined_raw or 'inspection' in combined_raw
@@ -305,32 +425,29 @@ def make_city_column(df):
     # They are collected here and removed before the numeric conversion   #
     # so they never produce NaN bars in the chart.                        #
     # ------------------------------------------------------------------ #
-    per_insp_idx_set = set(per_inspection_indices)
+    # Values that are purely numeric (with optional $, commas, etc.) are left
+    # for the normal conversion; so are values that look numeric via the
+    # extraction regex.
+    is_numeric = (
+        pd.to_numeric(cell_text.str.translate(CURRENCY_CHARS), errors='coerce').notna()
+        | cell_text.str.fullmatch(NUMERIC_CELL_RE)
+    )
+    special_mask = ~per_inspection_mask & ~is_numeric & (cell_text != '')
+    # float() accepts a few spellings to_numeric() rejects ('1_000'); check
+    # the handful of remaining cells with it so they stay numeric
+    if special_mask.any():
+        float_like = cell_text[special_mask].str.translate(CURRENCY_CHARS).map(parses_as_float)
+        special_mask.loc[float_like.index[float_like]] = False
+
     special_raw: Dict[str, Dict[str, List[str]]] = {}  # {pos: {emp: [values]}}
-    special_status_indices = []
-
-    for idx, row in melted.iterrows():
-        if idx in per_insp_idx_set:
-            continue  # already handled
-        val = str(row[salary]).strip()
-        if not val:
-            continue
-        # Skip values that are purely numeric (with optional $, commas, etc.)
-        try:
-            float(val.replace(',', '').replace('$', ''))
-            continue  # numeric — leave for the normal conversion
-        except (ValueError, TypeError):
-            pass
-        # Also skip values that look numeric via the extraction regex
-        if re.fullmatch(r'\$?\s*[\d,]+\.?\d*', val):
-            continue
-        pos = row[title]
-        emp = row[location]
+    for pos, emp, val in zip(melted.loc[special_mask, title],
+                             melted.loc[special_mask, location],
+                             cell_text[special_mask]):
         special_raw.setdefault(pos, {}).setdefault(emp, []).append(val)
-        special_status_indices.append(idx)
 
-    # Drop special-status rows so they don't end up as NaN after coercion
-    melted = melted.drop(index=special_status_indices)
+    # Remove per-inspection rows from the hourly data entirely, and drop
+    # special-status rows so they don't end up as NaN after coercion
+    melted = melted.drop(index=melted.index[per_inspection_mask | special_mask])
 
     # Classify the combined text for each (position, employer) pair
     special_statuses: Dict[str, Dict[str, dict]] = {}
@@ -345,11 +462,15 @@ def make_city_column(df):
                     'reference': reference,
                 }
 
-    # Convert salary to numeric
-    melted[salary] = pd.to_numeric(
-        melted[salary].astype(str).str.extract(r'(\d+\.?\d*)', expand=False),
+    # Convert salary to numeric.  Reuse the stripped cell text instead of
+    # re-stringifying the column, and run the extraction once per distinct
+    # value: salary tables repeat the same figures across many cells.
+    codes, uniques = pd.factorize(cell_text.loc[melted.index])
+    parsed = pd.to_numeric(
+        pd.Series(uniques, dtype=object).str.extract(SALARY_NUMBER_RE, expand=False),
         errors='coerce'
     )
+    melted[salary] = parsed.to_numpy()[codes]
     melted = melted.dropna(subset=[salary])
     # Filter out empty titles
     melted = melted[melted[title].str.len() > 0]
@@ -357,36 +478,18 @@ def make_city_column(df):
 
 
 def combine_high_low(df, location_name):
-    groups = df.groupby([location, title])
-
-    def helper(group):
-        minimum = group[salary].min()
-        maximum = group[salary].max()
-
-        # if minimum == maximum:
-        #     minimum = minimum * .99
-        #     maximum = maximum
-
-        client_color = '#e8f4fd'#'#AAA'
-        default_color = '#FFF'
-
-        if location_name in group[location].iloc[0]:
-            color = client_color
-        else:
-            color = default_color
-
-        return pd.Series(
-            data={
-                location: group[location].iloc[0],
-                title: group[title].iloc[0],
-                sal_min: minimum,
-                sal_max: maximum,
-                'color': color
-            },
-            index=[location, title, sal_min, sal_max, 'color']
-        )
+    # One grouped min/max reduction over every (location, title) pair instead
+    # of building a Series per group in Python.
+    combined = (
+        df.groupby([location, title])[salary]
+        .agg(['min', 'max'])
+        .rename(columns={'min': sal_min, 'max': sal_max})
+        .reset_index()
+    )
 
-    return pd.concat([helper(group) for name, group in groups], axis=1).transpose()
+    is_client = combined[location].str.contains(location_name, regex=False)
+    combined['color'] = is_client.map({True: CLIENT_COLOR, False: DEFAULT_COLOR})
+    return combined[[location, title, sal_min, sal_max, 'color']]
 
 
 def generate_text_summary(df: pd.DataFrame) -> str:
@@ -422,153 +525,131 @@ def generate_text_summary(df: pd.DataFrame) -> str:
     return "\n".join(lines)
 
 
-def graph(df, output, client_name: str = '', show_labels: bool = False, show_grid: bool = True):
-
-    for name, group in df.groupby(title):
-        # Sanitize name for filename by replacing slashes with underscores
-        safe_name = name.replace('/', '_')
-
-        group = group.sort_values(by=sal_max, ascending=True)
-        fig, ax = plt.subplots(figsize=(10, 8))
-        heights = group[sal_max] - group[sal_min]
-        
-        # Calculate y-axis range to determine appropriate thickness for zero-height bars
-        all_salaries = pd.concat([group[sal_min], group[sal_max]])
-        y_range = all_salaries.max() - all_salaries.min()
-        # Use a fixed percentage of the y-axis range for consistent thickness
-        ZERO_BAR_THICKNESS_RATIO = 0.02  # 2% of y-axis range
-        zero_bar_height = y_range * ZERO_BAR_THICKNESS_RATIO if y_range > 0 else 1.0
-        
-        # Adjust heights for zero-height bars
-        adjusted_heights = []
-        for h in heights:
-            if h == 0:
-                adjusted_heights.append(zero_bar_height)
-            else:
-                adjusted_heights.append(h)
-        
-        linewidths = [3 if h == 0 else 1 for h in heights]
-        bars = ax.bar(group[location], adjusted_heights, bottom=group[sal_min], color=group['color'], edgecolor='black', linewidth=linewidths, zorder=3)
-
-        if show_labels:
-            for bar, (_, row) in zip(bars, group.iterrows()):
-                ax.annotate(
-                    f'${row[sal_max]:,.0f}',
-                    xy=(bar.get_x() + bar.get_width() / 2, bar.get_y() + bar.get_height()),
-                    xytext=(0, 3), textcoords='offset points',
-                    ha='center', va='bottom', fontsize=7,
-                )
-
-        ax.set_ylabel("Hourly Pay")
-        ax.set_xlabel("Location")
-        # ax.set_title(name)
-        if show_grid:
-            ax.grid(True, color="#AAA", zorder=0)
-        ax.tick_params(axis="x", labelrotation=45, labelsize=8)
-        plt.setp(ax.get_xticklabels(), ha="right")
-        if client_name:
-            fig.canvas.draw()
-            for label in ax.get_xticklabels():
-                if client_name in label.get_text():
-                    label.set_color('#1565C0')
-                    label.set_fontweight('bold')
-        plt.tight_layout()
-
-        output_configs = {
-            'pdf': ('output/pdf', 'pdf'),
-            'png': ('output/png', 'png'),
-            'svg': ('output/svg', 'svg'),
-            'jpg': ('output/jpg', 'jpg'),
-            'jpeg': ('output/jpeg', 'jpeg'),
-            'webp': ('output/webp', 'webp'),
-            'eps': ('output/eps', 'eps'),
-        }
-        for fmt in output:
-            if fmt in output_configs:
-                dir_path, ext = output_configs[fmt]
-                os.makedirs(dir_path, exist_ok=True)
-                fig.savefig(f"{dir_path}/{safe_name}.{fmt}", bbox_inches="tight")
-        plt.close(fig)
-
+def sorted_position_groups(df) -> List[Tuple[str, pd.DataFrame]]:
+    """
+    Split *df* into ``(position, rows)`` pairs with each position's rows
+    ordered by max salary.
 
-def chart_to_svg(group: pd.DataFrame, name: str, client_name: str = '', show_labels: bool = False, show_grid: bool = True) -> str:
-    """Generate a bar chart for a position group and return it as an inline SVG string."""
-    group = group.sort_values(by=sal_max, ascending=True)
+    One sort covers every position; groupby keeps the row order within each
+    group, so no per-group sort is needed.
+    """
+    df = df.sort_values(by=[title, sal_max], kind='stable')
+    return list(df.groupby(title))
+
+
+def graph(df, output, client_name: str = '', show_labels: bool = False, show_grid: bool = True,
+          groups: Optional[List[Tuple[str, pd.DataFrame]]] = None):
+    # Raster files are written by a thread pool while the next chart renders;
+    # vector formats are saved inline since a figure can't be drawn from two
+    # threads at once.
+    pending = []
+    if groups is None:
+        groups = sorted_position_groups(df)
+    output_configs = {
+        'pdf': ('output/pdf', 'pdf'),
+        'png': ('output/png', 'png'),
+        'svg': ('output/svg', 'svg'),
+        'jpg': ('output/jpg', 'jpg'),
+        'jpeg': ('output/jpeg', 'jpeg'),
+        'webp': ('output/webp', 'webp'),
+        'eps': ('output/eps', 'eps'),
+    }
+    # Create each output directory once up front, not once per chart
+    for fmt in output:
+        if fmt in output_configs:
+            os.makedirs(output_configs[fmt][0], exist_ok=True)
+    # A single figure is cleared and redrawn for every position rather than
+    # building and tearing down a new one each time.  Each chart starts from
+    # the default margins so tight_layout lands where it would on a fresh
+    # figure.
     fig, ax = plt.subplots(figsize=(10, 8))
-    heights = group[sal_max] - group[sal_min]
-    
-    # Calculate y-axis range to determine appropriate thickness for zero-height bars
-    all_salaries = pd.concat([group[sal_min], group[sal_max]])
-    y_range = all_salaries.max() - all_salaries.min()
-    # Use a fixed percentage of the y-axis range for consistent thickness
-    ZERO_BAR_THICKNESS_RATIO = 0.02  # 2% of y-axis range
-    zero_bar_height = y_range * ZERO_BAR_THICKNESS_RATIO if y_range > 0 else 1.0
-    
-    # Adjust heights for zero-height bars
-    adjusted_heights = []
-    for h in heights:
-        if h == 0:
-            adjusted_heights.append(zero_bar_height)
-        else:
-            adjusted_heights.append(h)
-    
-    linewidths = [3 if h == 0 else 1 for h in heights]
-    bars = ax.bar(group[location], adjusted_heights, bottom=group[sal_min], color=group['color'],
-           edgecolor='black', linewidth=linewidths, zorder=3)
-
-    if show_labels:
-        for bar, (_, row) in zip(bars, group.iterrows()):
-            ax.annotate(
-                f'${row[sal_max]:,.0f}',
-                xy=(bar.get_x() + bar.get_width() / 2, bar.get_y() + bar.get_height()),
-                xytext=(0, 3), textcoords='offset points',
-                ha='center', va='bottom', fontsize=7,
-            )
-
-    ax.set_ylabel("Hourly Pay")
-    ax.set_xlabel("Location")
-    #ax.set_title(name)
-    if show_grid:
-        ax.grid(True, color="#AAA", zorder=0)
-    plt.xticks(rotation=60, ha='right', fontsize=8)
-    if client_name:
-        fig.canvas.draw()
-        for label in ax.get_xticklabels():
-            if client_name in label.get_text():
-                label.set_color('#1565C0')
-                label.set_fontweight('bold')
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format='svg', bbox_inches='tight')
+    default_margins = {
+        'left': plt.rcParams['figure.subplot.left'],
+        'right': plt.rcParams['figure.subplot.right'],
+        'bottom': plt.rcParams['figure.subplot.bottom'],
+        'top': plt.rcParams['figure.subplot.top'],
+    }
+    with ThreadPoolExecutor(max_workers=RASTER_SAVE_WORKERS) as pool:
+        for name, group in groups:
+            # Sanitize name for filename by replacing slashes with underscores
+            safe_name = name.replace('/', '_')
+
+            ax.clear()
+            fig.subplots_adjust(**default_margins)
+            lows = group[sal_min].to_numpy(dtype=float)
+            highs = group[sal_max].to_numpy(dtype=float)
+            adjusted_heights, linewidths = bar_geometry(lows, highs)
+            bars = ax.bar(group[location], adjusted_heights, bottom=lows, color=group['color'], edgecolor='black', linewidth=linewidths, zorder=3)
+
+            if show_labels and len(bars) <= LABEL_BUDGET:
+                ax.bar_label(bars, labels=[f'${high:,.0f}' for high in highs],
+                             padding=3, fontsize=7)
+
+            ax.set_ylabel("Hourly Pay")
+            ax.set_xlabel("Location")
+            # ax.set_title(name)
+            if show_grid:
+                ax.grid(True, color="#AAA", zorder=0)
+            ax.tick_params(axis="x", labelrotation=45, labelsize=8)
+            plt.setp(ax.get_xticklabels(), ha="right")
+            if client_name:
+                fig.canvas.draw()
+                for label in ax.get_xticklabels():
+                    if client_name in label.get_text():
+                        label.set_color(CLIENT_ACCENT_COLOR)
+                        label.set_fontweight('bold')
+            fig.tight_layout()
+
+            bbox = tight_bbox(fig)
+            png_bytes = None
+            for fmt in output:
+                if fmt in output_configs:
+                    dir_path, ext = output_configs[fmt]
+                    file_path = f"{dir_path}/{safe_name}.{fmt}"
+                    if fmt != 'png' and fmt not in PIL_FORMATS:
+                        fig.savefig(file_path, bbox_inches=bbox)
+                        continue
+                    # Rasterise the figure once; PNG bytes are written as-is and
+                    # JPEG/WebP are re-encoded from the same pixels by Pillow.
+                    if png_bytes is None:
+                        png_buffer = io.BytesIO()
+                        fig.savefig(png_buffer, format='png', bbox_inches=bbox,
+                                    pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+                        png_bytes = png_buffer.getvalue()
+                    pending.append(pool.submit(write_raster, png_bytes, file_path, fmt, dpi=fig.dpi))
     plt.close(fig)
-    buf.seek(0)
-    svg_string = buf.read().decode('utf-8')
-    # Strip XML declaration, keep just the <svg>...</svg> element
-    svg_content = svg_string[svg_string.find('<svg'):]
-    return svg_content
+
+    # Surface any encoder error from the background writes
+    for future in pending:
+        future.result()
 
 
 def graph_with_html(df, output_formats, client_name, input_file, per_inspection=None,
                     special_statuses=None,
                     show_labels: bool = False, show_grid: bool = True):
     """Generate graphs with optional HTML output"""
+    # Sort and split the data once; the charts and the report share it
+    groups = sorted_position_groups(df)
+
     # Generate image formats (non-HTML)
     image_formats = [fmt for fmt in output_formats if fmt != "html"]
     if image_formats:
-        graph(df, image_formats, client_name=client_name, show_labels=show_labels, show_grid=show_grid)
+        graph(df, image_formats, client_name=client_name, show_labels=show_labels, show_grid=show_grid,
+              groups=groups)
 
     # Generate HTML if requested
     if 'html' in output_formats:
         generate_html_report(df, client_name, input_file,
                              per_inspection or {},
                              special_statuses or {},
-                             show_labels=show_labels, show_grid=show_grid)
+                             show_labels=show_labels, show_grid=show_grid,
+                             groups=groups)
 
 
 def generate_html_report(df, client_name, input_file, per_inspection=None,
                          special_statuses=None,
-                         show_labels: bool = False, show_grid: bool = True):
+                         show_labels: bool = False, show_grid: bool = True,
+                         groups: Optional[List[Tuple[str, pd.DataFrame]]] = None):
     """Generate a self-contained HTML report with interactive Chart.js charts and filterable tables."""
     import json
     from datetime import datetime
@@ -577,11 +658,13 @@ def generate_html_report(df, client_name, input_file, per_inspection=None,
         per_inspection = {}
     if special_statuses is None:
         special_statuses = {}
+    if groups is None:
+        groups = sorted_position_groups(df)
 
     # Group data by position for HTML generation
     position_summaries = []
 
-    for position_name, group in df.groupby(title):
+    for position_name, sorted_group in groups:
         safe_name = position_name.replace('/', '_')
         # Escape single quotes for JavaScript string literals
         safe_name_js = safe_name.replace("'", "\\'")
@@ -594,26 +677,28 @@ def generate_html_report(df, client_name, input_file, per_inspection=None,
         
         # Continue with the rest of the data gathering
 
-        # Sort by salary range
-        sorted_group = group.sort_values(by=sal_max, ascending=True)
-
         # Create position summary (hourly employers) — these drive the chart
         chart_data = []  # only numeric/hourly rows go in the chart
         employers_data = []
-        for _, row in sorted_group.iterrows():
-            is_client = client_name in row[location]
+        # Pull each column out once as plain Python values rather than
+        # building a Series per row with iterrows() and indexing it repeatedly.
+        for employer, low, high, color in zip(sorted_group[location].tolist(),
+                                              sorted_group[sal_min].astype(float).tolist(),
+                                              sorted_group[sal_max].astype(float).tolist(),
+                                              sorted_group['color'].tolist()):
+            is_client = client_name in employer
             chart_data.append({
-                'employer': row[location],
-                'min': float(row[sal_min]),
-                'max': float(row[sal_max]),
-                'color': '#e8f4fd' if is_client else '#ffffff',
-                'borderColor': '#1565C0' if is_client else '#333333',
+                'employer': employer,
+                'min': low,
+                'max': high,
+                'color': color,
+                'borderColor': CLIENT_ACCENT_COLOR if is_client else DEFAULT_BORDER_COLOR,
                 'is_client': is_client,
             })
             employers_data.append({
-                'employer': row[location],
-                'min_salary': row[sal_min],
-                'max_salary': row[sal_max],
+                'employer': employer,
+                'min_salary': low,
+                'max_salary': high,
                 'is_client': is_client,
                 'per_inspection': False,
             })
@@ -654,7 +739,22 @@ def generate_html_report(df, client_name, input_file, per_inspection=None,
     # Generate HTML
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     input_stem = os.path.splitext(os.path.basename(input_file))[0]
-    html_content = f'''<!DOCTYPE html>
+
+    # Save HTML file, streaming fragments through a large write buffer
+    os.makedirs('output/html', exist_ok=True)
+    html_filename = f"{input_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+    html_path = os.path.join('output/html', html_filename)
+
+    with open(html_path, 'w', encoding='utf-8', buffering=HTML_WRITE_BUFFER) as f:
+        f.writelines(iter_html_report(position_summaries, client_name, input_stem,
+                                      all_chart_data_json, show_grid=show_grid))
+
+    print(f"HTML report saved to: {html_path}")
+
+
+# Static head (CSS + search legend) and trailing script of the HTML report.
+# iter_html_report() fills each in with one str.format() pass.
+HTML_REPORT_HEAD = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -1001,84 +1101,55 @@ def generate_html_report(df, client_name, input_file, per_inspection=None,
         <ul class="legend-list" id="legendList">
 '''
 
-    for position in position_summaries:
-        html_content += f'            <li class="legend-item" data-name="{position["name"].lower()}"><a href="#pos-{position["safe_name"]}">{position["name"]}</a></li>\n'
-
-    html_content += '''        </ul>
-        <p class="no-results" id="noResults" style="display:none;">No positions match your search.</p>
-        </div>
-    </div>
-
-'''
-
-    for position in position_summaries:
-        html_content += f'''
-    <div class="position-card" id="pos-{position['safe_name']}" data-position-name="{position['name'].lower()}">
-        <div class="position-title">{position['name']}</div>
+# Per-position card and table rows of the HTML report, filled in with
+# str.format() for every position and employer.
+HTML_POSITION_CARD_HEAD = '''
+    <div class="position-card" id="pos-{safe_name}" data-position-name="{name_lower}">
+        <div class="position-title">{name}</div>
         
         <div class="chart-container">
-            <canvas id="chart-{position['safe_name']}"></canvas>
+            <canvas id="chart-{safe_name}"></canvas>
         </div>
 
-        <table class="salary-table" id="table-{position['safe_name']}">
+        <table class="salary-table" id="table-{safe_name}">
             <thead>
                 <tr>
-                    <th class="sortable" data-col="employer" data-pos="{position['safe_name']}" onclick="sortTable('{position['safe_name_js']}', 'employer')">Employer <span class="sort-icon">&#8645;</span></th>
-                    <th class="sortable" data-col="min"      data-pos="{position['safe_name']}" onclick="sortTable('{position['safe_name_js']}', 'min')">Minimum <span class="sort-icon">&#8645;</span></th>
-                    <th class="sortable sort-asc" data-col="max"      data-pos="{position['safe_name']}" onclick="sortTable('{position['safe_name_js']}', 'max')">Maximum <span class="sort-icon">&#2191;</span></th>
+                    <th class="sortable" data-col="employer" data-pos="{safe_name}" onclick="sortTable('{safe_name_js}', 'employer')">Employer <span class="sort-icon">&#8645;</span></th>
+                    <th class="sortable" data-col="min"      data-pos="{safe_name}" onclick="sortTable('{safe_name_js}', 'min')">Minimum <span class="sort-icon">&#8645;</span></th>
+                    <th class="sortable sort-asc" data-col="max"      data-pos="{safe_name}" onclick="sortTable('{safe_name_js}', 'max')">Maximum <span class="sort-icon">&#2191;</span></th>
                 </tr>
             </thead>
             <tbody>
 '''
 
-        for employer in position['employers']:
-            if employer['per_inspection']:
-                if employer.get('fee_paid'):
-                    badge_html = '<span class="fee-paid-badge">&#128176; Fee Paid</span>'
-                else:
-                    rate_str = format_per_inspection_rate(employer['rates'])
-                    badge_html = f'<span class="per-inspection-badge">&#128338; {rate_str}</span>'
-                row_class = 'per-inspection-row' + (' client-row' if employer['is_client'] else '')
-                html_content += f'''
-                <tr class="{row_class}" data-employer="{employer['employer'].lower()}" data-min="" data-max="">
-                    <td>{employer['employer']}</td>
-                    <td colspan="2">{badge_html}</td>
-                </tr>
-'''
-            elif 'special_status' in employer:
-                ss = employer['special_status']
-                badge = render_special_status_badge(ss, position_summaries)
-                row_class = 'special-status-row' + (' client-row' if employer['is_client'] else '')
-                html_content += f'''
-                <tr class="{row_class}" data-employer="{employer['employer'].lower()}" data-min="" data-max="">
-                    <td>{employer['employer']}</td>
+HTML_BADGE_ROW = '''
+                <tr class="{row_class}" data-employer="{employer_lower}" data-min="" data-max="">
+                    <td>{employer}</td>
                     <td colspan="2">{badge}</td>
                 </tr>
 '''
-            else:
-                row_class = 'client-row' if employer['is_client'] else ''
-                html_content += f'''
-                <tr class="{row_class}" data-employer="{employer['employer'].lower()}" data-min="{employer['min_salary']:.2f}" data-max="{employer['max_salary']:.2f}">
-                    <td>{employer['employer']}</td>
-                    <td>${employer['min_salary']:,.2f}</td>
-                    <td>${employer['max_salary']:,.2f}</td>
+
+HTML_SALARY_ROW = '''
+                <tr class="{row_class}" data-employer="{employer_lower}" data-min="{min_salary:.2f}" data-max="{max_salary:.2f}">
+                    <td>{employer}</td>
+                    <td>${min_salary:,.2f}</td>
+                    <td>${max_salary:,.2f}</td>
                 </tr>
 '''
 
-        html_content += '''
+HTML_POSITION_CARD_FOOT = '''
             </tbody>
         </table>
     </div>
 '''
 
-    # Embed chart data + all interactive JS
-    html_content += f'''
+HTML_REPORT_SCRIPT = '''
     <button id="backToTop" title="Back to top">&#8679; Top</button>
 
     <script>
     // ── Embedded chart data (keyed by safe position name) ──────────────
     const ALL_CHART_DATA = {all_chart_data_json};
-    const showGrid = {str(show_grid).lower()};
+    const showGrid = {show_grid};
 
     // ── Chart registry ──────────────────────────────────────────────────
     const chartInstances = {{}};
@@ -1442,15 +1513,79 @@ def generate_html_report(df, client_name, input_file, per_inspection=None,
 </html>
 '''
 
-    # Save HTML file
-    os.makedirs('output/html', exist_ok=True)
-    html_filename = f"{input_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-    html_path = os.path.join('output/html', html_filename)
 
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+def iter_html_report(position_summaries, client_name, input_stem, all_chart_data_json,
+                     show_grid: bool = True):
+    """
+    Yield the HTML report document fragment by fragment.
 
-    print(f"HTML report saved to: {html_path}")
+    Rows are produced as they are formatted so the caller can stream them
+    straight to disk instead of materialising the whole document first.
+    """
+    # Badge links search every position name; list them once per report
+    position_names = [p['name'] for p in position_summaries]
+
+    yield HTML_REPORT_HEAD.format(client_name=client_name, input_stem=input_stem)
+
+    for position in position_summaries:
+        yield f'            <li class="legend-item" data-name="{position["name"].lower()}"><a href="#pos-{position["safe_name"]}">{position["name"]}</a></li>\n'
+
+    yield '''        </ul>
+        <p class="no-results" id="noResults" style="display:none;">No positions match your search.</p>
+        </div>
+    </div>
+
+'''
+
+    for position in position_summaries:
+        yield HTML_POSITION_CARD_HEAD.format(
+            name=position['name'],
+            name_lower=position['name'].lower(),
+            safe_name=position['safe_name'],
+            safe_name_js=position['safe_name_js'],
+        )
+
+        for employer in position['employers']:
+            if employer['per_inspection']:
+                if employer.get('fee_paid'):
+                    badge_html = '<span class="fee-paid-badge">&#128176; Fee Paid</span>'
+                else:
+                    rate_str = format_per_inspection_rate(employer['rates'])
+                    badge_html = f'<span class="per-inspection-badge">&#128338; {rate_str}</span>'
+                row_class = 'per-inspection-row' + (' client-row' if employer['is_client'] else '')
+                yield HTML_BADGE_ROW.format(
+                    row_class=row_class,
+                    employer=employer['employer'],
+                    employer_lower=employer['employer'].lower(),
+                    badge=badge_html,
+                )
+            elif 'special_status' in employer:
+                ss = employer['special_status']
+                badge = render_special_status_badge(ss, position_names)
+                row_class = 'special-status-row' + (' client-row' if employer['is_client'] else '')
+                yield HTML_BADGE_ROW.format(
+                    row_class=row_class,
+                    employer=employer['employer'],
+                    employer_lower=employer['employer'].lower(),
+                    badge=badge,
+                )
+            else:
+                row_class = 'client-row' if employer['is_client'] else ''
+                yield HTML_SALARY_ROW.format(
+                    row_class=row_class,
+                    employer=employer['employer'],
+                    employer_lower=employer['employer'].lower(),
+                    min_salary=employer['min_salary'],
+                    max_salary=employer['max_salary'],
+                )
+
+        yield HTML_POSITION_CARD_FOOT
+
+    # Embed chart data + all interactive JS
+    yield HTML_REPORT_SCRIPT.format(
+        all_chart_data_json=all_chart_data_json,
+        show_grid=str(show_grid).lower(),
+    )
 
 
 def print_error(message, suggestion=None):
@@ -1504,7 +1639,7 @@ def process(
         sys.exit(1)
 
     ext = os.path.splitext(file_path)[1].lower()
-    if ext not in ['.csv', '.xls', '.xlsx', '.ods']:
+    if ext not in SUPPORTED_EXTENSIONS:
         print_error(
             f"Unsupported file format: {ext}",
             "Supported formats: .csv, .xls, .xlsx, .ods",
@@ -1514,20 +1649,15 @@ def process(
     # ------------------------------------------------------------------ #
     # Detect column layout                                                 #
     # ------------------------------------------------------------------ #
+    df: Optional[pd.DataFrame] = None
     try:
         if ext == '.csv':
-            first_line = pd.read_csv(file_path, nrows=1).columns.tolist()
-            if all('Unnamed' in col or col.strip() == '' for col in first_line):
-                columns = pd.read_csv(file_path, skiprows=1, nrows=0).columns.tolist()
-                header_row = 1
-            else:
-                columns = first_line
-                header_row = 0
-        elif ext in ['.xls', '.xlsx']:
-            columns = pd.read_excel(file_path, nrows=0).columns.tolist()
-            header_row = 0
-        elif ext == '.ods':
-            columns = pd.read_excel(file_path, engine='odf', nrows=0).columns.tolist()
+            columns, header_row = read_csv_header(file_path)
+        else:
+            # The Excel/ODS readers parse the whole workbook even for nrows=0,
+            # so load the data once here and reuse it below.
+            df = read_data(file_path, ext)
+            columns = df.columns.tolist()
             header_row = 0
     except Exception as e:
         print_error(
@@ -1575,14 +1705,15 @@ def process(
     # ------------------------------------------------------------------ #
     # Load and transform data                                              #
     # ------------------------------------------------------------------ #
-    try:
-        df = read_data(file_path, ext, header_row)
-    except Exception as e:
-        print_error(
-            f"Error reading data file: {e}",
-            "Make sure the file format matches the extension",
-        )
-        sys.exit(1)
+    if df is None:
+        try:
+            df = read_data(file_path, ext, header_row)
+        except Exception as e:
+            print_error(
+                f"Error reading data file: {e}",
+                "Make sure the file format matches the extension",
+            )
+            sys.exit(1)
 
     # Normalise the title column name for downstream consistency
     if title_col != 'POSITION TITLE':
@@ -5,6 +5,8 @@ Placing pytest configuration here (rather than inside test files) ensures
 the markers and settings apply to the whole test suite regardless of which
 file is collected first.
 """
+import pandas as pd
+import pytest
 
 
 def pytest_configure(config):
@@ -17,3 +19,15 @@ def pytest_configure(config):
         "markers",
         "integration: marks tests as integration tests",
     )
+
+
+@pytest.fixture
+def chart_dataframe():
+    """Chart-ready rows (one per position and employer) for graph tests."""
+    return pd.DataFrame({
+        'location': ['Employer A', 'Employer B', 'Employer C', 'Employer A'],
+        'POSITION TITLE': ['Engineer', 'Engineer', 'Engineer', 'Clerk/Typist'],
+        'salary_min': [10.0, 12.0, 11.0, 20.0],
+        'salary_max': [15.0, 12.0, 14.0, 25.0],
+        'color': ['#FFF', '#4FC3F7', '#FFF', '#FFF'],
+    })
@@ -0,0 +1,108 @@
+"""
+test_chart_utils.py - Unit tests for the shared chart helpers
+
+Covers bar geometry, tight bounding boxes, and raster re-encoding.
+"""
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image
+
+from chart_utils import (
+    BAR_LINEWIDTH,
+    ZERO_BAR_LINEWIDTH,
+    ZERO_BAR_THICKNESS_RATIO,
+    bar_geometry,
+    tight_bbox,
+    write_raster,
+)
+
+
+@pytest.fixture
+def png_bytes():
+    """A small chart rendered to PNG."""
+    fig, ax = plt.subplots(figsize=(2, 1.5))
+    ax.bar(['A', 'B'], [1, 2])
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=100)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+# ============================================================================
+# Bar Geometry Tests
+# ============================================================================
+
+class TestBarGeometry:
+    """Tests for bar_geometry."""
+
+    def test_ranges_keep_their_height(self):
+        """Test non-empty ranges are drawn at their own height."""
+        heights, linewidths = bar_geometry(np.array([10.0, 12.0]), np.array([15.0, 20.0]))
+        np.testing.assert_array_equal(heights, [5.0, 8.0])
+        np.testing.assert_array_equal(linewidths, [BAR_LINEWIDTH, BAR_LINEWIDTH])
+
+    def test_zero_ranges_get_visible_sliver(self):
+        """Test equal low/high pay becomes a thin bar with a heavy outline."""
+        heights, linewidths = bar_geometry(np.array([10.0, 12.0]), np.array([20.0, 12.0]))
+        np.testing.assert_allclose(heights, [10.0, 10.0 * ZERO_BAR_THICKNESS_RATIO])
+        np.testing.assert_array_equal(linewidths, [BAR_LINEWIDTH, ZERO_BAR_LINEWIDTH])
+
+    def test_all_equal_values(self):
+        """Test a chart whose bars all sit at one value still has height."""
+        heights, linewidths = bar_geometry(np.array([12.0, 12.0]), np.array([12.0, 12.0]))
+        np.testing.assert_array_equal(heights, [1.0, 1.0])
+        np.testing.assert_array_equal(linewidths, [ZERO_BAR_LINEWIDTH, ZERO_BAR_LINEWIDTH])
+
+
+# ============================================================================
+# Saving Tests
+# ============================================================================
+
+class TestTightBbox:
+    """Tests for tight_bbox."""
+
+    def test_matches_savefig_tight(self):
+        """Test a precomputed bbox crops exactly like bbox_inches='tight'."""
+        fig, ax = plt.subplots(figsize=(4, 3))
+        ax.bar(['Employer A', 'Employer B'], [10, 20])
+        ax.set_xlabel('Location')
+        sizes = []
+        for bbox in ('tight', tight_bbox(fig)):
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', bbox_inches=bbox)
+            buffer.seek(0)
+            with Image.open(buffer) as image:
+                sizes.append(image.size)
+        plt.close(fig)
+        assert sizes[0] == sizes[1]
+
+
+class TestWriteRaster:
+    """Tests for write_raster."""
+
+    def test_png_written_unchanged(self, png_bytes, tmp_path):
+        """Test PNG output is the rendered bytes as-is."""
+        path = tmp_path / 'chart.png'
+        write_raster(png_bytes, path, 'png')
+        assert path.read_bytes() == png_bytes
+
+    @pytest.mark.parametrize("fmt,pil_format", [('jpg', 'JPEG'), ('webp', 'WEBP')])
+    def test_reencoded_formats(self, png_bytes, tmp_path, fmt, pil_format):
+        """Test JPEG/WebP keep the PNG's size and record the given dpi."""
+        path = tmp_path / f'chart.{fmt}'
+        write_raster(png_bytes, path, fmt, dpi=100)
+        with Image.open(path) as image, Image.open(io.BytesIO(png_bytes)) as png:
+            assert image.format == pil_format
+            assert image.size == png.size
+            if fmt == 'jpg':
+                assert image.info['dpi'] == (100, 100)
+
+    def test_scale_resizes(self, png_bytes, tmp_path):
+        """Test a scale below 1 downsizes the re-encoded image."""
+        path = tmp_path / 'chart.jpg'
+        write_raster(png_bytes, path, 'jpg', scale=0.5)
+        with Image.open(path) as image:
+            assert image.size == (100, 75)
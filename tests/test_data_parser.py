@@ -433,7 +433,7 @@ class TestGraphGenerator:
             from graph_generator import GraphConfig
             config = GraphConfig()
             assert config.show_grid is True
-            assert config.dpi == 300
+            assert config.dpi == 150
             assert config.output_dir == 'output'
         except ImportError:
             pytest.skip("Graph generator module not available")
@@ -447,6 +447,87 @@ class TestGraphGenerator:
             assert generator.config.show_labels is True
         except ImportError:
             pytest.skip("Graph generator module not available")
+    
+    def test_jpeg_dpi_never_upscales(self, chart_dataframe, tmp_path):
+        """Test JPEGs are never larger than PNGs when dpi is below jpeg_dpi."""
+        from PIL import Image
+        from graph_generator import GraphGenerator, GraphConfig
+        config = GraphConfig(dpi=100, jpeg_dpi=150, output_dir=str(tmp_path))
+        GraphGenerator(config).generate_graphs(
+            chart_dataframe, ['png', 'jpg'], 'Employer B', 'test.csv'
+        )
+        with Image.open(tmp_path / 'png' / 'Engineer.png') as png, \
+                Image.open(tmp_path / 'jpg' / 'Engineer.jpg') as jpg:
+            assert jpg.width <= png.width
+            assert jpg.height <= png.height
+            assert round(jpg.info['dpi'][0]) == 100
+    
+    def test_jpeg_only_uses_requested_dpi(self, chart_dataframe, tmp_path):
+        """Test a JPEG-only run renders at dpi when it is below jpeg_dpi."""
+        from PIL import Image
+        from graph_generator import GraphGenerator, GraphConfig
+        config = GraphConfig(dpi=100, jpeg_dpi=150, output_dir=str(tmp_path))
+        GraphGenerator(config).generate_graphs(
+            chart_dataframe, ['jpg'], 'Employer B', 'test.csv'
+        )
+        with Image.open(tmp_path / 'jpg' / 'Engineer.jpg') as jpg:
+            assert round(jpg.info['dpi'][0]) == 100
+    
+    def test_parallel_rendering_matches_serial(self, chart_dataframe, tmp_path, caplog):
+        """Test workers > 1 writes the same files, in the same order, as a serial run."""
+        import logging
+        from graph_generator import GraphGenerator, GraphConfig
+        formats = ['png', 'jpg']
+        serial_dir = tmp_path / 'serial'
+        parallel_dir = tmp_path / 'parallel'
+        serial = GraphGenerator(GraphConfig(output_dir=str(serial_dir))).generate_graphs(
+            chart_dataframe, formats, 'Employer B', 'test.csv'
+        )
+        with caplog.at_level(logging.INFO, logger='graph_generator'):
+            parallel = GraphGenerator(
+                GraphConfig(output_dir=str(parallel_dir), workers=2)
+            ).generate_graphs(
+                chart_dataframe, formats, 'Employer B', 'test.csv', show_progress=True
+            )
+        
+        assert [Path(f).relative_to(parallel_dir) for f in parallel] == \
+            [Path(f).relative_to(serial_dir) for f in serial]
+        for serial_file, parallel_file in zip(serial, parallel):
+            assert Path(serial_file).read_bytes() == Path(parallel_file).read_bytes()
+        assert 'Processed 2/2 positions' in caplog.text
+    
+    def test_html_thumbnails_link_png_from_this_run(self, chart_dataframe, tmp_path):
+        """Test thumbnails link full-size PNGs only when this run wrote them."""
+        from graph_generator import GraphGenerator, GraphConfig
+        config = GraphConfig(html_thumbnail_dpi=30, output_dir=str(tmp_path))
+        generator = GraphGenerator(config)
+        
+        files = generator.generate_graphs(
+            chart_dataframe, ['png', 'html'], 'Employer B', 'test.csv'
+        )
+        html = Path(files[-1]).read_text(encoding='utf-8')
+        assert 'data:image/jpeg;base64,' in html
+        assert 'href="../png/Engineer.png"' in html
+        
+        # The PNGs from the first run are still on disk but not part of this one
+        files = generator.generate_graphs(
+            chart_dataframe, ['html'], 'Employer B', 'test.csv'
+        )
+        html = Path(files[-1]).read_text(encoding='utf-8')
+        assert 'data:image/jpeg;base64,' in html
+        assert '../png/' not in html
+    
+    def test_html_without_charts(self, chart_dataframe, tmp_path):
+        """Test html_charts=False produces a table-only report."""
+        from graph_generator import GraphGenerator, GraphConfig
+        config = GraphConfig(html_charts=False, output_dir=str(tmp_path))
+        files = GraphGenerator(config).generate_graphs(
+            chart_dataframe, ['html'], 'Employer B', 'test.csv'
+        )
+        html = Path(files[-1]).read_text(encoding='utf-8')
+        assert '<div class="chart-container">' not in html
+        assert '<svg' not in html
+        assert 'class="salary-table"' in html
 
 
 # pytest markers are registered in tests/conftest.py.
@@ -0,0 +1,156 @@
+"""
+test_main.py - Unit tests for the main module
+
+Covers CSV header detection and loading, the cell classification done by
+make_city_column, and static chart output.
+"""
+import sys
+
+import pandas as pd
+import pytest
+
+import main
+
+
+# ============================================================================
+# CSV Reading Tests
+# ============================================================================
+
+class TestCSVReading:
+    """Tests for read_csv_header and read_csv_data."""
+
+    @pytest.mark.parametrize("header", [
+        "POSITION TITLE,A,A,A.1,A",
+        "POSITION TITLE,A.1,A,A",
+        "POSITION TITLE,,B,,B",
+    ])
+    def test_column_names_match_pandas(self, header, tmp_path):
+        """Test repeated and blank headers are named exactly as pandas names them."""
+        csv_file = tmp_path / "dup.csv"
+        width = header.count(',')
+        csv_file.write_text(f"{header}\nClerk{',1' * width}\n,{'0,' * (width - 1)}0\n")
+        expected = pd.read_csv(csv_file).columns.tolist()
+
+        columns, header_row = main.read_csv_header(str(csv_file))
+        assert columns == expected
+        assert header_row == 0
+        assert main.read_csv_data(str(csv_file)).columns.tolist() == expected
+
+    def test_header_below_blank_row(self, tmp_path):
+        """Test the header is taken from the second row when the first is blank."""
+        csv_file = tmp_path / "offset.csv"
+        csv_file.write_text(",,\nPOSITION TITLE,A,B\nClerk,1,2\n,0,1\n")
+
+        columns, header_row = main.read_csv_header(str(csv_file))
+        assert columns == ['POSITION TITLE', 'A', 'B']
+        assert header_row == 1
+        df = main.read_csv_data(str(csv_file), header_row)
+        assert df.columns.tolist() == columns
+        assert df[main.title].tolist() == ['Clerk', '']
+
+
+    @pytest.mark.parametrize("engine", ['c', 'pyarrow'])
+    def test_engines_read_titles_as_text(self, engine, tmp_path, monkeypatch):
+        """Test both CSV engines keep 'N/A' and numeric titles as written."""
+        if engine == 'pyarrow':
+            pytest.importorskip('pyarrow')
+        else:
+            # Hide pyarrow so read_csv_data falls back to the C parser
+            monkeypatch.setitem(sys.modules, 'pyarrow', None)
+        csv_file = tmp_path / "titles.csv"
+        csv_file.write_text(
+            "POSITION TITLE,A,B\n"
+            "Clerk,10,TRUE\n,8,1\n"
+            "N/A,12,TRUE\n,9,\n"
+            "1,14,true\n,11,False\n"
+        )
+
+        df = main.read_csv_data(str(csv_file))
+        assert df[main.title].tolist() == ['Clerk', '', 'N/A', '', '1', '']
+        assert df['B'].tolist()[:3] == ['TRUE', '1', 'TRUE']
+        assert pd.isna(df['B'].iloc[3])
+        pairs = main.combine_lines(df)[main.title].tolist()
+        assert pairs == [['Clerk', 'Clerk'], ['N/A', 'N/A'], ['1', '1']]
+
+
+# ============================================================================
+# Cell Classification Tests
+# ============================================================================
+
+@pytest.fixture
+def mixed_cells_dataframe():
+    """One row per title with hourly, per-inspection and special-status cells."""
+    return pd.DataFrame({
+        'POSITION TITLE': ['Building Inspector', 'Building Inspector', 'Town Clerk', 'Town Clerk'],
+        'Townville Current': [30.5, 35.25, 20.0, 24.0],
+        'Alpha': ['$1,234', '$1,300.50', 'Done by Town Manager', None],
+        'Beta': ['$30 per inspection', '$45 per inspection', 'Cape Cod', 'District'],
+        'Gamma': ['Fee paid', None, 'Outsourced', ''],
+        'Delta': ['See Fin Dir', '   ', '1_000', '$ 22.10'],
+    })
+
+
+class TestMakeCityColumn:
+    """Tests for the per-cell classification in make_city_column."""
+
+    def test_hourly_rows(self, mixed_cells_dataframe):
+        """Test numeric cells become hourly rows and everything else is dropped."""
+        melted, _, _ = main.make_city_column(mixed_cells_dataframe)
+        rows = list(zip(melted[main.title], melted[main.location], melted[main.salary]))
+        # The salary extraction stops at the first comma or underscore, so
+        # '$1,234' and '1_000' chart as 1
+        assert rows == [
+            ('Building Inspector', 'Townville Current', 30.5),
+            ('Building Inspector', 'Townville Current', 35.25),
+            ('Town Clerk', 'Townville Current', 20.0),
+            ('Town Clerk', 'Townville Current', 24.0),
+            ('Building Inspector', 'Alpha', 1.0),
+            ('Building Inspector', 'Alpha', 1.0),
+            ('Town Clerk', 'Delta', 1.0),
+            ('Town Clerk', 'Delta', 22.1),
+        ]
+
+    def test_per_inspection(self, mixed_cells_dataframe):
+        """Test per-inspection rates are collected and fee-paid cells flagged."""
+        _, per_inspection, _ = main.make_city_column(mixed_cells_dataframe)
+        assert per_inspection == {
+            'Building Inspector': {
+                'Beta': {'rates': [30.0, 45.0], 'fee_paid': False},
+                'Gamma': {'rates': [], 'fee_paid': True},
+            },
+        }
+
+    def test_special_statuses(self, mixed_cells_dataframe):
+        """Test 'See', 'Done by', district and outsourced notes are classified."""
+        _, _, special_statuses = main.make_city_column(mixed_cells_dataframe)
+        assert special_statuses == {
+            'Building Inspector': {
+                'Delta': {'type': 'see', 'display': 'Fin Dir', 'reference': 'Fin Dir'},
+            },
+            'Town Clerk': {
+                'Alpha': {'type': 'done_by', 'display': 'Town Manager', 'reference': 'Town Manager'},
+                'Beta': {'type': 'district', 'display': 'Cape Cod District', 'reference': None},
+                'Gamma': {'type': 'outsourced', 'display': 'Outsourced', 'reference': None},
+            },
+        }
+
+
+# ============================================================================
+# Chart Output Tests
+# ============================================================================
+
+class TestGraph:
+    """Tests for the static chart writer."""
+
+    def test_raster_formats_share_one_render(self, chart_dataframe, tmp_path, monkeypatch):
+        """Test JPEG/WebP match the PNG's size and keep the figure's dpi."""
+        from PIL import Image
+        monkeypatch.chdir(tmp_path)
+        main.graph(chart_dataframe, ['png', 'jpg', 'webp'], client_name='Employer B')
+
+        with Image.open('output/png/Clerk_Typist.png') as png:
+            for fmt in ('jpg', 'webp'):
+                with Image.open(f'output/{fmt}/Clerk_Typist.{fmt}') as image:
+                    assert image.size == png.size
+            with Image.open('output/jpg/Clerk_Typist.jpg') as jpg:
+                assert jpg.info['dpi'] == (100, 100)